@@ -57,8 +57,6 @@ def sign(
         )
     if policy:
         policy = loads(policy)
-    else:
-        policy = {}
     cookies = Signer(
         cloudfront_key_id=key_id, priv_key_file=priv_key_file
     ).generate_cookies(Resource=resource, Policy=policy, SecondsBeforeExpires=expires)
@@ -1,9 +1,8 @@
-from os.path import exists
 from json import dumps
-from datetime import datetime, timedelta
-from base64 import b64encode
-from typing import Union
-from re import match
+from functools import lru_cache, partial
+from time import time
+from typing import List, Optional, Union
+import re
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.asymmetric import padding
@@ -14,8 +13,23 @@ from cloudfront_signed_cookies.errors import (
     InvalidPrivateKeyFormat,
 )
 
+try:
+    from pybase64 import b64encode
+except ImportError:  # no cov
+    from base64 import b64encode
+
+_B64_URLSAFE_TABLE = bytes.maketrans(b"+=/", b"-_~")
+_KEY_ID_RE = re.compile(r"^[A-Z0-9]+\Z")
+
 
 class Signer:
+    _ALLOWED_COND_KEYS = frozenset(("DateLessThan", "DateGreaterThan", "IpAddress"))
+    _COND_SUBKEY = {
+        "DateLessThan": "AWS:EpochTime",
+        "DateGreaterThan": "AWS:EpochTime",
+        "IpAddress": "AWS:SourceIp",
+    }
+
     def __init__(self, cloudfront_key_id: str, priv_key_file: str) -> None:
         """Initializes `Signer` object.
 
@@ -23,34 +37,35 @@ class Signer:
             cloudfront_key_id(str): the ID assigned to the public key in CloudFront
             priv_key_file(str): the path to the private PEM-formatted key
         """
-        if not match(r"^[A-Z0-9]{1,}$", cloudfront_key_id):
+        if not _KEY_ID_RE.match(cloudfront_key_id):
             raise InvalidCloudFrontKeyId(
-                "CloudFront public key ID must match the following regex: ^[A-Z0-9]{1,}$"
+                "CloudFront public key ID must match the following regex: ^[A-Z0-9]+\\Z"
             )
         else:
             self.cloudfront_key_id: str = cloudfront_key_id
-        if exists(priv_key_file):
-            with open(priv_key_file, mode="rb") as priv_file:
-                key_bytes = priv_file.read()
-                try:
-                    self.priv_key = serialization.load_pem_private_key(
-                        key_bytes, password=None
-                    )
-                except ValueError:
-                    raise InvalidPrivateKeyFormat(
-                        "provided private key is not formatted correctly"
-                    )
-        else:
-            raise PrivateKeyNotFound(f"{priv_key_file} not found")
+        try:
+            priv_file = open(priv_key_file, mode="rb")
+        except FileNotFoundError:
+            raise PrivateKeyNotFound(f"{priv_key_file} not found") from None
+        with priv_file:
+            key_bytes = priv_file.read()
+        try:
+            self.priv_key = serialization.load_pem_private_key(
+                key_bytes, password=None
+            )
+        except ValueError:
+            raise InvalidPrivateKeyFormat(
+                "provided private key is not formatted correctly"
+            )
+        self._sign_bytes = partial(
+            self.priv_key.sign, padding=padding.PKCS1v15(), algorithm=hashes.SHA1()
+        )
 
     def _sign(self, policy: str) -> bytes:
         """Generate signature from policy and the private key associated
         with the public key in the CloudFront trusted key group.
         """
-        signature: bytes = self.priv_key.sign(
-            data=policy.encode(), padding=padding.PKCS1v15(), algorithm=hashes.SHA1()
-        )
-        return signature
+        return self._sign_bytes(policy.encode())
 
     def _validate_custom_policy(self, policy: dict):
         """Validates custom policy for signed cookie.
@@ -77,86 +92,80 @@ class Signer:
         """
         conditions: dict = {}
         resource: str = ""
-        allowed_condition_keys = ["DateLessThan", "DateGreaterThan", "IpAddress"]
-        allowed_condition_key_subkeys = {
-            "DateLessThan": "AWS:EpochTime",
-            "DateGreaterThan": "AWS:EpochTime",
-            "IpAddress": "AWS:SourceIp",
-        }
 
         try:
             statements: Union[list, dict] = policy["Statement"]
         except KeyError:
             raise InvalidCustomPolicy("policy is missing Statement") from None
         if statements:
-
-            def raise_missing_condition_exception():
-                raise InvalidCustomPolicy(
-                    "policy statement must have Condition block"
-                ) from None
-
-            if type(statements) == list:
+            if isinstance(statements, list):
                 statement = statements[0]
                 try:
                     conditions = statement["Condition"]
                     resource = statement["Resource"]
                 except KeyError:
-                    raise_missing_condition_exception()
-            elif type(statements) == dict:
+                    raise InvalidCustomPolicy(
+                        "policy statement must have Condition block"
+                    ) from None
+            elif isinstance(statements, dict):
                 try:
                     conditions = statements["Condition"]
                     resource = statements["Resource"]
                 except KeyError:
-                    raise_missing_condition_exception()
+                    raise InvalidCustomPolicy(
+                        "policy statement must have Condition block"
+                    ) from None
         else:
             raise InvalidCustomPolicy("policy statement is empty")
 
-        resource_type: type = type(resource)
-        if resource_type != str:
+        if not isinstance(resource, str):
             raise InvalidCustomPolicy(
-                f"provided Resource must be of type 'str', not '{resource_type}'"
+                f"provided Resource must be of type 'str', not '{type(resource)}'"
+            )
+
+        if not isinstance(conditions, dict):
+            raise InvalidCustomPolicy(
+                f"Condition must be of type 'dict', not {type(conditions)}"
             )
 
         if "DateLessThan" not in conditions:
             raise InvalidCustomPolicy("missing required condition key 'DateLessThan'")
 
-        for key in conditions:
-            if key not in allowed_condition_keys:
+        invalid_keys = conditions.keys() - self._ALLOWED_COND_KEYS
+        if invalid_keys:
+            raise InvalidCustomPolicy(
+                f"invalid condition key: {next(iter(invalid_keys))} "
+                "- key must be DateLessThan, DateGreaterThan, or IpAddress"
+            )
+
+        for key, sub_keys in conditions.items():
+            if not isinstance(sub_keys, dict):
+                raise InvalidCustomPolicy(
+                    "condition key value must be of type 'dict'"
+                    f", not {type(sub_keys)}"
+                )
+            sub_key = self._COND_SUBKEY[key]
+            invalid_sub_keys = sub_keys.keys() - {sub_key}
+            if invalid_sub_keys:
+                invalid_sub_key = next(iter(invalid_sub_keys))
                 raise InvalidCustomPolicy(
-                    f"invalid condition key: {key} "
-                    "- key must be DateLessThan, DateGreaterThan, or IpAddress"
+                    f"invalid condition key sub-key found: {invalid_sub_key}"
                 )
-            condition_key_value_type = type(conditions[key])
-            if condition_key_value_type == dict:
-                for sub_key in conditions[key]:
-                    if sub_key != allowed_condition_key_subkeys[key]:
-                        raise InvalidCustomPolicy(
-                            f"invalid condition key sub-key found: {sub_key}"
-                        )
-                    condition_key_subkey_value_type: type = type(
-                        conditions[key][sub_key]
-                    )
-                    if (
-                        sub_key == "AWS:EpochTime"
-                        and condition_key_subkey_value_type != int
-                    ):
-                        raise InvalidCustomPolicy(
-                            "AWS:EpochTime value must be of type 'int'"
-                            f", not {condition_key_subkey_value_type}"
-                        )
-                    else:
-                        if (
-                            sub_key == "IpAddress"
-                            and condition_key_subkey_value_type != str
-                        ):
-                            raise InvalidCustomPolicy(
-                                f"{sub_key} value must be of type 'str'"
-                                f", not {condition_key_subkey_value_type}"
-                            )
-            else:
+            try:
+                value = sub_keys[sub_key]
+            except KeyError:
                 raise InvalidCustomPolicy(
-                    "condition key value must be of type 'dict'"
-                    f", not {condition_key_value_type}"
+                    f"condition key {key} is missing sub-key {sub_key}"
+                ) from None
+            if sub_key == "AWS:EpochTime" and (
+                isinstance(value, bool) or not isinstance(value, int)
+            ):
+                raise InvalidCustomPolicy(
+                    f"AWS:EpochTime value must be of type 'int', not {type(value)}"
+                )
+            elif sub_key == "AWS:SourceIp" and not isinstance(value, str):
+                raise InvalidCustomPolicy(
+                    f"{sub_key} value must be of type 'str', not {type(value)}"
                 )
 
         if "DateLessThan" in conditions and "DateGreaterThan" in conditions:
@@ -168,43 +177,58 @@ class Signer:
                     "'DateLessThan' cannot be less than value for 'DateGreaterThan'"
                 )
 
-    def _make_canned_policy(self, resource: str, expiration_date: int):
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _make_canned_policy(resource: str, expiration_date: int) -> str:
         """Returns default canned policy for signed cookies which only
         uses the `DataLessThan` condition.
+
+        The policy has a fixed shape, so it is rendered directly as compact
+        JSON; only the resource URL needs escaping.
         """
-        policy = {
-            "Statement": [
-                {
-                    "Resource": resource,
-                    "Condition": {"DateLessThan": {"AWS:EpochTime": expiration_date}},
-                }
-            ]
-        }
-        return self._to_json(policy)
+        return (
+            f'{{"Statement":[{{"Resource":{dumps(resource)},'
+            f'"Condition":{{"DateLessThan":{{"AWS:EpochTime":'
+            f"{int(expiration_date)}}}}}}}]}}"
+        )
 
-    def _sanitize_b64(self, s: str) -> str:
-        """Removes invalid characters from final base64-encoded string.
+    @staticmethod
+    def _sanitize_b64(raw: bytes) -> str:
+        """Removes invalid characters from final base64-encoded bytes
+        and returns the result as a string.
 
         + -> -
         = -> _
         / -> ~
         """
-        for k, v in {"+": "-", "=": "_", "/": "~"}.items():
-            s = s.replace(k, v)
-        return s
+        return raw.translate(_B64_URLSAFE_TABLE).decode("ascii")
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _encoded_policy(policy: str) -> str:
+        """Returns the sanitized base64 encoding of a policy.
+
+        Cached, since the same policy is often signed several times in a row
+        (e.g. many cookies for one resource issued within the same second).
+        """
+        return Signer._sanitize_b64(b64encode(policy.encode("utf8")))
 
     def _to_json(self, s: dict) -> str:
         """Converts dict to JSON string stripped of whitespaces."""
         return dumps(s, separators=(",", ":"))
 
     def generate_cookies(
-        self, Resource: str = "", Policy: dict = {}, SecondsBeforeExpires: int = 900
+        self,
+        Resource: str = "",
+        Policy: Optional[dict] = None,
+        SecondsBeforeExpires: int = 900,
     ) -> dict:
         """Generate and return signed cookies for accessing content behind CloudFront.
 
         Args:
             Resource(str): base URL for the resource you want to allow access to
-            Policy(dict): custom policy statement for signed cookie
+            Policy(dict): custom policy statement for signed cookie; when omitted
+                or empty, a canned policy for `Resource` is used
             SecondsBeforeExpires(int): numbers of seconds before cookie expires,
                 default=900 (15 minutes)
 
@@ -218,19 +242,48 @@ class Signer:
         else:
             if not Resource:
                 raise ValueError("must provide a resource URL")
-            expires_on: datetime = datetime.now() + timedelta(
-                seconds=SecondsBeforeExpires
-            )
-            policy: str = self._make_canned_policy(
-                resource=Resource, expiration_date=int(expires_on.timestamp())
-            )
+            expiration: int = int(time()) + int(SecondsBeforeExpires)
+            policy: str = self._make_canned_policy(Resource, expiration)
+        return self._make_cookies(policy)
+
+    def generate_cookies_batch(
+        self, Resources: List[str], SecondsBeforeExpires: int = 900
+    ) -> List[dict]:
+        """Generate and return signed cookies for several resources at once
+        using the canned policy.
+
+        All cookies share the same expiration time.
+
+        Args:
+            Resources(list): base URLs for the resources you want to allow access to
+            SecondsBeforeExpires(int): numbers of seconds before cookies expire,
+                default=900 (15 minutes)
+
+        Returns:
+            list: returns one dict of CloudFront-Policy, CloudFront-Signature,
+                and CloudFront-Key-Pair-Id cookies per resource, in order
+        """
+        if isinstance(Resources, str):
+            raise TypeError("Resources must be a list of resource URLs, not a str")
+        Resources = list(Resources)
+        if not all(Resources):
+            raise ValueError("must provide a resource URL")
+        expiration: int = int(time()) + int(SecondsBeforeExpires)
+        make_canned_policy = self._make_canned_policy
+        make_cookies = self._make_cookies
+        return [
+            make_cookies(make_canned_policy(resource, expiration))
+            for resource in Resources
+        ]
+
+    def _make_cookies(self, policy: str) -> dict:
+        """Signs the policy and returns the CloudFront cookies for it."""
         signature: bytes = self._sign(policy)
 
-        encoded_policy = b64encode(policy.encode("utf8")).decode(encoding="utf8")
-        encoded_signature = b64encode(signature).decode(encoding="utf8")
+        encoded_signature: bytes = b64encode(signature)
 
         return {
-            "CloudFront-Policy": self._sanitize_b64(encoded_policy),
+            "CloudFront-Policy": self._encoded_policy(policy),
             "CloudFront-Signature": self._sanitize_b64(encoded_signature),
             "CloudFront-Key-Pair-Id": self.cloudfront_key_id,
         }
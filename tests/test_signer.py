@@ -1,4 +1,7 @@
 import pytest
+from base64 import b64decode
+from json import loads
+from time import time
 from datetime import datetime
 from cloudfront_signed_cookies.signer import Signer
 from cloudfront_signed_cookies.errors import (
@@ -23,6 +26,75 @@ def test_generate_cookies():
     assert cookies != {}
 
 
+def test_generate_cookies_batch():
+    resources: list = [
+        "https://s3.amazonaws.com/somefile.txt",
+        "https://s3.amazonaws.com/otherfile.txt",
+    ]
+    cookies: list = signer.generate_cookies_batch(
+        Resources=resources, SecondsBeforeExpires=3600
+    )
+    assert len(cookies) == len(resources)
+    statements: list = [
+        loads(
+            b64decode(
+                c["CloudFront-Policy"].translate(str.maketrans("-_~", "+=/"))
+            )
+        )["Statement"][0]
+        for c in cookies
+    ]
+    assert [s["Resource"] for s in statements] == resources
+    expirations: set = {
+        s["Condition"]["DateLessThan"]["AWS:EpochTime"] for s in statements
+    }
+    assert len(expirations) == 1
+    assert 0 <= expirations.pop() - int(time()) <= 3600
+
+
+def test_generate_cookies_batch_from_generator():
+    cookies: list = signer.generate_cookies_batch(
+        Resources=(
+            f"https://s3.amazonaws.com/{name}.txt" for name in ("somefile", "other")
+        ),
+    )
+    assert len(cookies) == 2
+
+
+def test_generate_cookies_batch_for_str_resources():
+    with pytest.raises(TypeError):
+        signer.generate_cookies_batch(
+            Resources="https://s3.amazonaws.com/somefile.txt",
+        )
+
+
+def test_generate_cookies_batch_for_empty_resource():
+    with pytest.raises(ValueError):
+        signer.generate_cookies_batch(
+            Resources=["https://s3.amazonaws.com/somefile.txt", ""],
+        )
+
+
+def test_canned_policy_format():
+    policy: str = signer._make_canned_policy(
+        resource='https://s3.amazonaws.com/"some file".txt', expiration_date=1000
+    )
+    assert policy == (
+        '{"Statement":[{"Resource":"https://s3.amazonaws.com/\\"some file\\".txt",'
+        '"Condition":{"DateLessThan":{"AWS:EpochTime":1000}}}]}'
+    )
+
+
+def test_custom_policy_json_is_compact():
+    policy: str = signer._to_json(
+        {"Statement": [{"Resource": "some url", "Condition": {}}]}
+    )
+    assert policy == '{"Statement":[{"Resource":"some url","Condition":{}}]}'
+
+
+def test_sanitize_b64():
+    assert signer._sanitize_b64(b"a+b/c==") == "a-b~c__"
+
+
 def test_private_key_file_not_exists():
     with pytest.raises(PrivateKeyNotFound):
         Signer(
@@ -106,6 +178,21 @@ def test_custom_policy_for_invalid_subkeys():
         )
 
 
+def test_custom_policy_for_missing_subkey():
+    with pytest.raises(InvalidCustomPolicy):
+        signer.generate_cookies(
+            Policy={
+                "Statement": [
+                    {
+                        "Resource": "URL",
+                        "Condition": {"DateLessThan": {}},
+                    }
+                ]
+            },
+            SecondsBeforeExpires=600,
+        )
+
+
 def test_custom_policy_for_invalid_subkey_types():
     with pytest.raises(InvalidCustomPolicy):
         signer.generate_cookies(
@@ -121,6 +208,39 @@ def test_custom_policy_for_invalid_subkey_types():
         )
 
 
+def test_custom_policy_for_bool_epoch_time():
+    with pytest.raises(InvalidCustomPolicy):
+        signer.generate_cookies(
+            Policy={
+                "Statement": [
+                    {
+                        "Resource": "URL",
+                        "Condition": {"DateLessThan": {"AWS:EpochTime": True}},
+                    }
+                ]
+            },
+            SecondsBeforeExpires=600,
+        )
+
+
+def test_custom_policy_for_invalid_source_ip_type():
+    with pytest.raises(InvalidCustomPolicy):
+        signer.generate_cookies(
+            Policy={
+                "Statement": [
+                    {
+                        "Resource": "URL",
+                        "Condition": {
+                            "DateLessThan": {"AWS:EpochTime": 1000},
+                            "IpAddress": {"AWS:SourceIp": 10},
+                        },
+                    }
+                ]
+            },
+            SecondsBeforeExpires=600,
+        )
+
+
 def test_for_invalid_cloudfront_key_id():
     with pytest.raises(InvalidCloudFrontKeyId):
         Signer(